@@ -13,14 +13,69 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import random
 import itertools
+import argparse
+import threading
+import uuid
+import queue
+import mmap
+import zlib
 import numpy as np
-from concurrent.futures import ProcessPoolExecutor
-from requests_futures.sessions import FuturesSession
-
-session = FuturesSession()
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+# Shared session for the Google API calls so connections are reused
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+CACHE_TTL_SECONDS = 6 * 60 * 60  # Refetch ratings, hours and phone numbers after 6 hours
+CACHE_MAX_ENTRIES = 10000
+MAX_FINISHED_JOBS = 200
+MAX_RADIUS = 100000  # Meters; calculate_grid_size treats 100 km and above as its top bucket
+
+
+class ExpiringCache:
+    """Thread-safe cache whose entries expire after a TTL, evicting the oldest entries past max_entries."""
+
+    def __init__(self, ttl_seconds=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self.entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.monotonic(), value)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# In-memory caches, kept warm across jobs when running in service mode
+_coordinates_cache = ExpiringCache()
+_place_details_cache = ExpiringCache()
 
 LOG_FILE = "log_script_initial_contact.log"
 
+# Set from --record/--replay; when set, every Google API response goes through the archive
+response_archive = None
+
 def setup_logging():
     """Initialize logging and prevent duplicate handlers."""
     logger = logging.getLogger("business_logger")  # Unique logger name
@@ -316,23 +371,142 @@ def update_form_file(search_phrase, business):
         return False
 
 
+class ArchivedResponse:
+    """Minimal stand-in for requests.Response when replaying from the archive."""
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseArchive:
+    """Append-only archive of raw API responses with an offset index for record/replay.
+
+    Each raw response body is zlib-compressed and appended to the data file. The index file
+    (same path plus ``.idx``) holds one JSON line per record with its key, offset and length.
+    """
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.index = {}
+
+        if mode == "record":
+            self.data_file = open(self.path, "ab")
+            self.index_file = open(self.index_path, "a+")
+            # Start on a fresh line if a previous record run was killed mid-write
+            if self.index_file.tell() > 0:
+                self.index_file.seek(self.index_file.tell() - 1)
+                if self.index_file.read(1) != "\n":
+                    self.index_file.write("\n")
+        elif mode == "replay":
+            with open(self.index_path, "r") as file:
+                for line_number, line in enumerate(file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Left behind when a record run was killed mid-write
+                        logger.warning(f"Skipping truncated line {line_number} of {self.index_path}")
+                        continue
+                    self.index[entry["key"]] = entry  # Later records win
+            self.data_file = open(self.path, "rb")
+            size = os.fstat(self.data_file.fileno()).st_size
+            self.data = mmap.mmap(self.data_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        else:
+            raise ValueError(f"Unknown archive mode: {mode}")
+
+    @staticmethod
+    def make_key(kind, params):
+        # The API key is left out so archives replay regardless of which key recorded them
+        params = {k: v for k, v in params.items() if k != "key"}
+        return f"{kind}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    def record(self, key, response):
+        blob = zlib.compress(response.content)
+
+        with self.lock:
+            offset = self.data_file.seek(0, os.SEEK_END)
+            self.data_file.write(blob)
+            self.data_file.flush()
+            entry = {"key": key, "offset": offset, "length": len(blob), "status_code": response.status_code}
+            self.index_file.write(json.dumps(entry) + "\n")
+            self.index_file.flush()
+
+    def lookup(self, key):
+        entry = self.index.get(key)
+        if entry is None:
+            logger.error(f"No archived response for {key}")
+            return ArchivedResponse(404, b'{"status": "NOT_ARCHIVED"}')
+
+        blob = self.data[entry["offset"]:entry["offset"] + entry["length"]]
+        return ArchivedResponse(entry["status_code"], zlib.decompress(blob))
+
+    def close(self):
+        if self.mode == "record":
+            self.index_file.close()
+        elif isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data_file.close()
+
+
+def open_response_archive(path, mode):
+    try:
+        return ResponseArchive(path, mode)
+    except FileNotFoundError as e:
+        logger.error(f"Error: {e}. Ensure the archive {path} and its index {path}.idx exist.")
+        exit()
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Error opening response archive {path}: {e}. Check that it is a readable archive.")
+        exit()
+
+
+def archived_get(kind, params, fetch):
+    """Run an API request through the response archive when recording or replaying."""
+    if response_archive is None:
+        return fetch()
+
+    key = ResponseArchive.make_key(kind, params)
+    if response_archive.mode == "replay":
+        return response_archive.lookup(key)
+
+    response = fetch()
+    response_archive.record(key, response)
+    return response
+
+
 # Get full URL from a shortened Google Maps link
 def get_full_url_from_short_link(short_link):
-    response = requests.head(short_link, allow_redirects=True)
+    response = http_session.head(short_link, allow_redirects=True)
     return response.url
 
 
 # Get coordinates from Google Maps link
 def get_coordinates_from_google_maps_link(link, api_key):
-    full_url = get_full_url_from_short_link(link)
-    geocode_url = f'https://maps.googleapis.com/maps/api/geocode/json?address={full_url}&key={api_key}'
-
-    response = requests.get(geocode_url)
+    # Skip the cache while archiving so every job's responses are recorded and replayed
+    cached = _coordinates_cache.get(link) if response_archive is None else None
+    if cached is not None:
+        return cached
+
+    def fetch():
+        full_url = get_full_url_from_short_link(link)
+        geocode_url = f'https://maps.googleapis.com/maps/api/geocode/json?address={full_url}&key={api_key}'
+        return http_session.get(geocode_url)
+
+    # Archived under the short link so replay needs no redirect lookup
+    response = archived_get("geocode", {"link": link}, fetch)
     data = response.json()
 
     if response.status_code == 200 and data['status'] == 'OK':
         lat = data['results'][0]['geometry']['location']['lat']
         lng = data['results'][0]['geometry']['location']['lng']
+        _coordinates_cache.set(link, (lat, lng))  # Only cache successful lookups
         return lat, lng
     else:
         return None
@@ -341,8 +515,7 @@ def fetch_businesses_from_google(google_places_url, location, search_phrase, rad
     all_results = []
     params = {'location': location, 'radius': radius, 'keyword': search_phrase, 'key': api_key}
 
-    future = session.get(google_places_url, params=params)  # Async API request
-    response = future.result()  # Get result when ready
+    response = archived_get("nearby", params, lambda: http_session.get(google_places_url, params=params))
 
     if response.status_code == 200:
         data = response.json()
@@ -351,9 +524,9 @@ def fetch_businesses_from_google(google_places_url, location, search_phrase, rad
         next_page_token = data.get("next_page_token")
         while next_page_token:
             params["pagetoken"] = next_page_token
-            time.sleep(1.2)  # Required delay for Google API
-            future = session.get(google_places_url, params=params)  # Async call
-            response = future.result()
+            if response_archive is None or response_archive.mode != "replay":
+                time.sleep(1.2)  # Required delay for Google API
+            response = archived_get("nearby", params, lambda: http_session.get(google_places_url, params=params))
             if response.status_code == 200:
                 data = response.json()
                 all_results.extend(data.get("results", []))
@@ -364,18 +537,25 @@ def fetch_businesses_from_google(google_places_url, location, search_phrase, rad
     return {"results": all_results}
 
 def fetch_place_details(place_id, api_key):
+    cached = _place_details_cache.get(place_id) if response_archive is None else None
+    if cached is not None:
+        return cached
+
     details_url = "https://maps.googleapis.com/maps/api/place/details/json"
     params = {'place_id': place_id, 'key': api_key}
-    response = requests.get(details_url, params=params)
+    response = archived_get("details", params, lambda: http_session.get(details_url, params=params))
     if response.status_code == 200:
-        return response.json()
+        details_data = response.json()
+        if details_data.get("status") == "OK":  # Don't cache quota or request errors
+            _place_details_cache.set(place_id, details_data)
+        return details_data
     else:
         logger.error(f"Error fetching place details for {place_id}: {response.status_code}")
         return None
 
 def fetch_businesses_from_text_search(text_search_url, query, api_key):
     params = {'query': query, 'key': api_key}
-    response = requests.get(text_search_url, params=params)
+    response = archived_get("text_search", params, lambda: http_session.get(text_search_url, params=params))
     if response.status_code == 200:
         return response.json().get("results", [])
     else:
@@ -407,7 +587,7 @@ def filter_highly_rated_businesses(results, min_rating=4.0, min_reviews=100):
         business for business in results
         if business.get("rating", 0) >= min_rating and business.get("user_ratings_total", 0) >= min_reviews
     ]
-def fetch_all_businesses(location, search_phrase, radius, api_key, grid_size=None, filter_function=False):
+def fetch_all_businesses(location, search_phrase, radius, api_key, grid_size=None, filter_function=False, executor=None):
     google_places_url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
     text_search_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
 
@@ -418,7 +598,15 @@ def fetch_all_businesses(location, search_phrase, radius, api_key, grid_size=Non
     print(f"Fetching businesses... Running {len(grid_coordinates)} parallel searches!")
     logger.info(f"Total searches to process: {len(grid_coordinates)}")
 
-    with ProcessPoolExecutor(max_workers=20) as executor:  # Uses multiple CPU cores
+    # Reuse a long-lived executor when one is passed in (service mode), otherwise spin one up
+    owns_executor = executor is None
+    if owns_executor:
+        if response_archive is not None:
+            executor = ThreadPoolExecutor(max_workers=20)  # Threads share the open archive
+        else:
+            executor = ProcessPoolExecutor(max_workers=20)  # Uses multiple CPU cores
+
+    try:
         futures = [
             executor.submit(fetch_businesses_from_google, google_places_url, f"{grid[0]},{grid[1]}", search_phrase, radius, api_key)
             for grid in grid_coordinates
@@ -433,6 +621,9 @@ def fetch_all_businesses(location, search_phrase, radius, api_key, grid_size=Non
                 logger.info(f"Processed {i+1}/{len(futures)} grid points")
             except Exception as e:
                 logger.error(f"Error fetching businesses at {i+1}/{len(futures)}: {e}")
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True)
 
     # Get text search results (was running in parallel)
     text_results = text_search_future.result()
@@ -505,7 +696,7 @@ def extract_business_details(places_data, api_key, country_codes_dict):
     return businesses
 
 # Create folder based on the request
-def create_folder_and_save_files(search_phrase, businesses):
+def create_folder_and_save_files(search_phrase, businesses, base_dir=None):
     """Create initial folder and requests file without sorting (already sorted in main)."""
     try:
         print("\n=== Starting Folder Creation ===")
@@ -513,7 +704,7 @@ def create_folder_and_save_files(search_phrase, businesses):
 
         # Format the folder name
         folder_name = search_phrase.lower().replace(" ", "_")
-        current_dir = os.getcwd()
+        current_dir = base_dir if base_dir else os.getcwd()
         folder_path = os.path.join(current_dir, folder_name)
 
         print(f"Creating folder at: {folder_path}")
@@ -621,6 +812,220 @@ def calculate_grid_size(radius):
         return 0.075  # ~8.3 km per step
 
 
+def search_businesses(env_params, country_codes_dict, search_phrase, maps_link, radius, executor=None):
+    """Resolve the location, fetch and extract businesses, and return them sorted by reviews and rating."""
+    api_key = env_params["GOOGLE_MAPS_API_KEY"]
+
+    # Retrieve coordinates
+    coordinates = get_coordinates_from_google_maps_link(maps_link, api_key)
+    if not coordinates:
+        print("Failed to get coordinates")
+        return None
+
+    location = coordinates  # (lat, lng)
+    print(f"Retrieved location: {location}")
+
+    # Dynamically calculate grid size based on the radius
+    grid_size = calculate_grid_size(radius)
+    print(f"Calculated grid size: {grid_size} for radius: {radius}")
+
+    # Fetch businesses with dynamic grid size
+    places_data = fetch_all_businesses(location, search_phrase, radius, api_key,
+                                       grid_size, filter_function=False, executor=executor)
+    if not places_data:
+        print("Failed to fetch places data")
+        return []
+
+    businesses = extract_business_details(places_data, api_key, country_codes_dict)
+    print(f"Extracted details for {len(businesses)} businesses")
+
+    # Sort businesses before passing them to send_messages
+    return sorted(
+        businesses,
+        key=lambda x: (x.get("Reviews", 0), x.get("Rating", 0)),
+        reverse=True  # Sort in descending order
+    )
+
+
+class SearchService:
+    """Long-running service that keeps config, HTTP pools and caches warm between search jobs."""
+
+    def __init__(self, env_params, max_jobs=4, max_workers=20):
+        self.env_params = env_params
+        self.country_codes_dict, _ = load_prerequisites(env_params)
+        self.jobs_dir = os.path.abspath(env_params.get("JOBS_DIR", "jobs"))
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        # Grid searches are I/O bound, so threads share the warm connection pools. Each job slot
+        # gets its own share of the threads so a large job can't queue ahead of the others.
+        self.search_executors = queue.Queue()
+        for _ in range(max_jobs):
+            self.search_executors.put(ThreadPoolExecutor(max_workers=max(1, max_workers // max_jobs)))
+        self.job_executor = ThreadPoolExecutor(max_workers=max_jobs)
+        # Search threads plus job threads (place details) can all hold a connection at once
+        pool_size = max(1, max_workers // max_jobs) * max_jobs + max_jobs
+        http_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=pool_size))
+
+    def submit(self, request):
+        """Queue a search job. Missing fields fall back to env_parameters.json values.
+
+        Raises ValueError if the request is not a JSON object or has an invalid field.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("Job request must be a JSON object")
+
+        search_phrase = request.get("search_phrase", self.env_params["search_phrase"])
+        if (not isinstance(search_phrase, str) or not search_phrase.strip()
+                or "/" in search_phrase or "\\" in search_phrase or ".." in search_phrase):
+            raise ValueError("search_phrase must be a non-empty string without path separators or '..'")
+
+        maps_link = request.get("GOOGLE_MAPS_LINK", self.env_params["GOOGLE_MAPS_LINK"])
+        host = urlparse(maps_link).hostname if isinstance(maps_link, str) else None
+        if not host or not (host == "goo.gl" or host.endswith(".goo.gl")
+                            or host == "google.com" or host.endswith(".google.com")):
+            raise ValueError("GOOGLE_MAPS_LINK must be a Google Maps link")
+
+        radius = request.get("RADIUS", self.env_params["RADIUS"])
+        if isinstance(radius, bool) or (isinstance(radius, float) and not radius.is_integer()):
+            raise ValueError("RADIUS must be a whole number of meters")
+        radius = int(radius)
+        if not 0 < radius <= MAX_RADIUS:
+            raise ValueError(f"RADIUS must be between 1 and {MAX_RADIUS} meters")
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "search_phrase": search_phrase,
+            "GOOGLE_MAPS_LINK": maps_link,
+            "RADIUS": radius,
+            "output_dir": os.path.join(self.jobs_dir, job_id),
+            "businesses": None,
+            "error": None,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None
+        }
+        with self.lock:
+            self._prune_finished_jobs()
+            self.jobs[job_id] = job
+        self.job_executor.submit(self._run_job, job_id)
+        logger.info(f"Queued job {job_id} for search phrase: {job['search_phrase']}")
+        return self.get(job_id)
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self):
+        with self.lock:
+            return [dict(job) for job in self.jobs.values()]
+
+    def _prune_finished_jobs(self):
+        """Drop the oldest finished jobs past MAX_FINISHED_JOBS. Caller must hold the lock."""
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            self.jobs[job_id].update(fields)
+
+    def _run_job(self, job_id):
+        job = self.get(job_id)
+        self._update(job_id, status="running", started_at=time.time())
+        # One executor per job thread, so a free one is always waiting here
+        search_executor = self.search_executors.get()
+        try:
+            businesses = search_businesses(self.env_params, self.country_codes_dict, job["search_phrase"],
+                                           job["GOOGLE_MAPS_LINK"], job["RADIUS"], executor=search_executor)
+            if businesses is None:
+                raise RuntimeError("Failed to get coordinates")
+
+            os.makedirs(job["output_dir"], exist_ok=True)
+            if not create_folder_and_save_files(job["search_phrase"], businesses, base_dir=job["output_dir"]):
+                raise RuntimeError("Failed to create folder and files")
+
+            self._update(job_id, status="done", businesses=len(businesses), finished_at=time.time())
+            logger.info(f"Job {job_id} finished with {len(businesses)} businesses")
+        except Exception as e:
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+            logger.error(f"Job {job_id} failed: {str(e)}")
+        finally:
+            self.search_executors.put(search_executor)
+
+    def shutdown(self):
+        self.job_executor.shutdown(wait=True)
+        while not self.search_executors.empty():
+            self.search_executors.get().shutdown(wait=True)
+
+
+def make_request_handler(service):
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        """POST /jobs to submit a search, GET /jobs or /jobs/<id> for status."""
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = self.path.strip("/").split("/")
+            if parts == ["jobs"]:
+                self._send_json(200, service.list())
+            elif len(parts) == 2 and parts[0] == "jobs":
+                job = service.get(parts[1])
+                if job:
+                    self._send_json(200, job)
+                else:
+                    self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            else:
+                self._send_json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if self.path.strip("/") != "jobs":
+                self._send_json(404, {"error": "Not found"})
+                return
+            # Requiring JSON stops browser pages from posting jobs with "simple" cross-site requests
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type != "application/json":
+                self._send_json(415, {"error": "Content-Type must be application/json"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                self._send_json(202, service.submit(request))
+            except (ValueError, TypeError, OverflowError) as e:
+                self._send_json(400, {"error": f"Invalid job request: {e}"})
+
+        def log_message(self, format, *args):
+            logger.info(f"{self.address_string()} - {format % args}")
+
+    return JobRequestHandler
+
+
+def serve(host, port):
+    """Run the search service until interrupted."""
+    env_params = load_env_parameters()
+    service = SearchService(env_params, max_jobs=int(env_params.get("MAX_CONCURRENT_JOBS", 4)))
+    server = ThreadingHTTPServer((host, port), make_request_handler(service))
+
+    print(f"Search service listening on http://{host}:{port}")
+    logger.info(f"Search service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Shutting down search service")
+    finally:
+        server.server_close()
+        service.shutdown()
+        logger.info("Search service stopped.")
+
+
 def main():
     try:
         print("\n=== Starting Script Execution ===")
@@ -633,66 +1038,37 @@ def main():
         search_phrase = env_params["search_phrase"]
         print(f"Processing search phrase: {search_phrase}")
 
-        # Retrieve coordinates
-        coordinates = get_coordinates_from_google_maps_link(env_params["GOOGLE_MAPS_LINK"],
-                                                            env_params["GOOGLE_MAPS_API_KEY"])
-
-        if coordinates:
-            location = coordinates  # (lat, lng)
-            print(f"Retrieved location: {location}")
-
-            # Dynamically calculate grid size based on the radius
-            radius = env_params["RADIUS"]
-            grid_size = calculate_grid_size(radius)
-            print(f"Calculated grid size: {grid_size} for radius: {radius}")
-
-            # Fetch businesses with dynamic grid size
-            places_data = fetch_all_businesses(location, search_phrase, radius, env_params["GOOGLE_MAPS_API_KEY"],
-                                               grid_size,filter_function=False)
-            businesses = []
-
-            if places_data:
-                businesses = extract_business_details(places_data, env_params["GOOGLE_MAPS_API_KEY"],
-                                                      country_codes_dict)
-                print(f"Extracted details for {len(businesses)} businesses")
-
-                if businesses:
-                    # Sort businesses before passing them to send_messages
-                    sorted_businesses = sorted(
-                        businesses,
-                        key=lambda x: (x.get("Reviews", 0), x.get("Rating", 0)),
-                        reverse=True  # Sort in descending order
-                    )
-
-                    folder_created = create_folder_and_save_files(search_phrase, sorted_businesses)
-
-                    if folder_created:
-                        print("Successfully created folder and files")
-
-                        try:
-                            phone_numbers = [business["Phone"] for business in sorted_businesses if
-                                             business["Phone"] != "No phone available"]
-
-                            if not verify_whatsapp_profile(env_params):
-                                print("WhatsApp phone number verification failed. Stopping execution.")
-                                logger.error("WhatsApp phone number verification failed.")
-                                return
-
-                            # Pass the sorted list to send_messages
-                            successful_businesses = send_messages(phone_numbers, message, sorted_businesses,
-                                                                  search_phrase, env_params)
-                        except Exception as e:
-                            print(f"Error in message sending: {str(e)}")
-                            logger.error(f"Error in message sending: {str(e)}")
-
-                    else:
-                        print("Failed to create folder and files")
-                else:
-                    print("No businesses found to process")
+        sorted_businesses = search_businesses(env_params, country_codes_dict, search_phrase,
+                                              env_params["GOOGLE_MAPS_LINK"], env_params["RADIUS"])
+
+        if sorted_businesses:
+            folder_created = create_folder_and_save_files(search_phrase, sorted_businesses)
+
+            if folder_created and response_archive is not None and response_archive.mode == "replay":
+                print("Successfully created folder and files from the archive, skipping messages")
+            elif folder_created:
+                print("Successfully created folder and files")
+
+                try:
+                    phone_numbers = [business["Phone"] for business in sorted_businesses if
+                                     business["Phone"] != "No phone available"]
+
+                    if not verify_whatsapp_profile(env_params):
+                        print("WhatsApp phone number verification failed. Stopping execution.")
+                        logger.error("WhatsApp phone number verification failed.")
+                        return
+
+                    # Pass the sorted list to send_messages
+                    successful_businesses = send_messages(phone_numbers, message, sorted_businesses,
+                                                          search_phrase, env_params)
+                except Exception as e:
+                    print(f"Error in message sending: {str(e)}")
+                    logger.error(f"Error in message sending: {str(e)}")
+
             else:
-                print("Failed to fetch places data")
-        else:
-            print("Failed to get coordinates")
+                print("Failed to create folder and files")
+        elif sorted_businesses is not None:
+            print("No businesses found to process")
 
         print("=== Script Execution Completed ===\n")
         logger.info("=== Script Execution Completed ===")
@@ -708,8 +1084,32 @@ if __name__ == "__main__":
         os.remove(LOG_FILE)
         print(f"Existing log file {LOG_FILE} deleted.")
 
+    parser = argparse.ArgumentParser(description="Find businesses and contact them over WhatsApp.")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a long-lived search service instead of a single run")
+    parser.add_argument("--host", default="127.0.0.1", help="Host for the search service")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the search service")
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument("--record", metavar="ARCHIVE",
+                               help="Append every raw Google API response to this archive")
+    archive_group.add_argument("--replay", metavar="ARCHIVE",
+                               help="Feed the pipeline from this archive without any network calls")
+    args = parser.parse_args()
+
     # ✅ Initialize logging before calling main()
     logger = setup_logging()
 
-    # ✅ Run the main function
-    main()
\ No newline at end of file
+    if args.record:
+        response_archive = open_response_archive(args.record, "record")
+    elif args.replay:
+        response_archive = open_response_archive(args.replay, "replay")
+
+    # ✅ Run the search service or the main function
+    try:
+        if args.serve:
+            serve(args.host, args.port)
+        else:
+            main()
+    finally:
+        if response_archive is not None:
+            response_archive.close()
\ No newline at end of file
@@ -0,0 +1,36 @@
+import json
+import logging
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pywhatkit drives the desktop through pyautogui and fails to import without a display
+try:
+    import pywhatkit  # noqa: F401
+except Exception:
+    sys.modules["pywhatkit"] = types.ModuleType("pywhatkit")
+
+import script_initial_contact  # noqa: E402
+
+
+class FakeResponse:
+    """Stand-in for requests.Response. Pass data for a JSON body or content for raw bytes."""
+
+    def __init__(self, status_code, data=None, content=None, url=None):
+        self.status_code = status_code
+        self.content = content if content is not None else json.dumps(data).encode("utf-8")
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content)
+
+
+@pytest.fixture(autouse=True)
+def script(monkeypatch):
+    """The script module, with the logger that is normally created under __main__."""
+    monkeypatch.setattr(script_initial_contact, "logger", logging.getLogger("business_logger"), raising=False)
+    return script_initial_contact
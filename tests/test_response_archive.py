@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+from conftest import FakeResponse
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    return str(tmp_path / "responses.arc")
+
+
+def record(script, archive_path, records):
+    archive = script.ResponseArchive(archive_path, "record")
+    for key, response in records:
+        archive.record(key, response)
+    archive.close()
+
+
+def test_make_key_leaves_out_api_key(script):
+    key = script.ResponseArchive.make_key("details", {"place_id": "p1", "key": "SECRET"})
+
+    assert "SECRET" not in key
+    assert key == script.ResponseArchive.make_key("details", {"key": "OTHER", "place_id": "p1"})
+    assert key != script.ResponseArchive.make_key("nearby", {"place_id": "p1"})
+
+
+def test_record_replay_round_trip(script, archive_path):
+    details_key = script.ResponseArchive.make_key("details", {"place_id": "p1"})
+    nearby_key = script.ResponseArchive.make_key("nearby", {"location": "1,2"})
+    record(script, archive_path, [
+        (details_key, FakeResponse(200, {"status": "OK", "result": {"name": "A"}})),
+        (nearby_key, FakeResponse(500, {"status": "UNKNOWN_ERROR"})),
+    ])
+
+    archive = script.ResponseArchive(archive_path, "replay")
+    details = archive.lookup(details_key)
+    nearby = archive.lookup(nearby_key)
+    missing = archive.lookup("details:missing")
+    archive.close()
+
+    assert (details.status_code, details.json()) == (200, {"status": "OK", "result": {"name": "A"}})
+    assert nearby.status_code == 500
+    assert missing.status_code == 404
+
+
+def test_duplicate_keys_replay_latest_record(script, archive_path):
+    key = script.ResponseArchive.make_key("details", {"place_id": "p1"})
+    record(script, archive_path, [(key, FakeResponse(200, {"status": "OK", "version": 1}))])
+    record(script, archive_path, [(key, FakeResponse(200, {"status": "OK", "version": 2}))])
+
+    archive = script.ResponseArchive(archive_path, "replay")
+    assert archive.lookup(key).json()["version"] == 2
+    archive.close()
+
+
+def test_non_json_body_is_stored_raw(script, archive_path):
+    key = script.ResponseArchive.make_key("geocode", {"link": "https://maps.app.goo.gl/abc"})
+    record(script, archive_path, [(key, FakeResponse(200, content=b"<html>quota page</html>"))])
+
+    archive = script.ResponseArchive(archive_path, "replay")
+    response = archive.lookup(key)
+    archive.close()
+
+    assert response.content == b"<html>quota page</html>"  # Stored exactly as the API returned it
+    with pytest.raises(ValueError):
+        response.json()
+
+
+def test_empty_archive_replays_and_closes(script, archive_path):
+    record(script, archive_path, [])
+
+    archive = script.ResponseArchive(archive_path, "replay")
+    assert archive.lookup("details:missing").status_code == 404
+    archive.close()
+
+
+def test_truncated_last_index_line_is_skipped(script, archive_path):
+    key = script.ResponseArchive.make_key("details", {"place_id": "p1"})
+    record(script, archive_path, [(key, FakeResponse(200, {"status": "OK"}))])
+    with open(f"{archive_path}.idx", "a") as file:
+        file.write('{"key": "details:{\\"place_id\\": ')  # Record run killed mid-write
+
+    archive = script.ResponseArchive(archive_path, "replay")
+    assert archive.lookup(key).json() == {"status": "OK"}
+    archive.close()
+
+    # Recording again starts on a fresh line, so the new entry stays readable
+    other_key = script.ResponseArchive.make_key("details", {"place_id": "p2"})
+    record(script, archive_path, [(other_key, FakeResponse(200, {"status": "OK", "id": 2}))])
+    archive = script.ResponseArchive(archive_path, "replay")
+    assert archive.lookup(key).json() == {"status": "OK"}
+    assert archive.lookup(other_key).json() == {"status": "OK", "id": 2}
+    archive.close()
+
+
+def test_missing_archive_exits_with_logged_error(script, archive_path, caplog):
+    with pytest.raises(SystemExit):
+        script.open_response_archive(archive_path, "replay")
+    assert "Ensure the archive" in caplog.text
+    assert not os.path.exists(archive_path)
+
+
+def test_replay_feeds_pipeline_without_network(script, archive_path, monkeypatch):
+    params = {"place_id": "p1"}
+    record(script, archive_path, [
+        (script.ResponseArchive.make_key("details", params),
+         FakeResponse(200, {"status": "OK", "result": {"formatted_phone_number": "012 345"}})),
+    ])
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("Replay must not touch the network")
+
+    monkeypatch.setattr(script.http_session, "get", no_network)
+    monkeypatch.setattr(script, "_place_details_cache", script.ExpiringCache())
+    monkeypatch.setattr(script, "response_archive", script.ResponseArchive(archive_path, "replay"))
+
+    details = script.fetch_place_details("p1", "any-key")
+    script.response_archive.close()
+
+    assert details["result"]["formatted_phone_number"] == "012 345"
+
+
+def test_recording_bypasses_caches(script, archive_path, monkeypatch):
+    link = "https://maps.app.goo.gl/abc"
+    monkeypatch.setattr(script, "_coordinates_cache", script.ExpiringCache())
+    monkeypatch.setattr(script, "_place_details_cache", script.ExpiringCache())
+    script._coordinates_cache.set(link, (1.0, 2.0))
+    script._place_details_cache.set("p1", {"status": "OK", "result": {"name": "Cached"}})
+
+    geocode = {"status": "OK", "results": [{"geometry": {"location": {"lat": 3.0, "lng": 4.0}}}]}
+    details = {"status": "OK", "result": {"name": "Fetched"}}
+    monkeypatch.setattr(script.http_session, "head", lambda *args, **kwargs: FakeResponse(200, url=link))
+    monkeypatch.setattr(script.http_session, "get",
+                        lambda url, **kwargs: FakeResponse(200, geocode if "geocode" in url else details))
+    monkeypatch.setattr(script, "response_archive", script.ResponseArchive(archive_path, "record"))
+
+    assert script.get_coordinates_from_google_maps_link(link, "key") == (3.0, 4.0)
+    assert script.fetch_place_details("p1", "key")["result"]["name"] == "Fetched"
+    script.response_archive.close()
+
+    archive = script.ResponseArchive(archive_path, "replay")
+    assert archive.lookup(script.ResponseArchive.make_key("geocode", {"link": link})).status_code == 200
+    assert archive.lookup(script.ResponseArchive.make_key("details", {"place_id": "p1"})).status_code == 200
+    archive.close()
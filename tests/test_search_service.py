@@ -0,0 +1,210 @@
+import http.client
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from conftest import FakeResponse
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def env_params(tmp_path):
+    return {
+        "GOOGLE_MAPS_API_KEY": "test-key",
+        "GOOGLE_MAPS_LINK": "https://maps.app.goo.gl/abc",
+        "RADIUS": 1000,
+        "search_phrase": "restaurant",
+        "country_code_file": os.path.join(REPO_DIR, "prep_country_code.csv"),
+        "message_file": os.path.join(REPO_DIR, "prep_message.txt"),
+        "JOBS_DIR": str(tmp_path / "jobs"),
+    }
+
+
+@pytest.fixture
+def service(script, env_params):
+    service = script.SearchService(env_params, max_jobs=1, max_workers=2)
+    yield service
+    service.shutdown()
+
+
+def wait_for_jobs(service):
+    service.job_executor.shutdown(wait=True)
+
+
+def test_submit_runs_job_to_done(script, service, monkeypatch):
+    businesses = [{"Name": "A", "Phone": "+1"}, {"Name": "B", "Phone": "+2"}]
+    monkeypatch.setattr(script, "search_businesses", lambda *args, **kwargs: businesses)
+
+    job = service.submit({"search_phrase": "coffee shop"})
+    assert job["status"] in ("queued", "running", "done")
+    wait_for_jobs(service)
+
+    job = service.get(job["id"])
+    assert job["status"] == "done"
+    assert job["businesses"] == 2
+    assert job["started_at"] is not None and job["finished_at"] is not None
+    assert os.path.exists(os.path.join(job["output_dir"], "coffee_shop", "requests_coffee_shop.csv"))
+
+
+def test_job_without_coordinates_fails(script, service, monkeypatch):
+    monkeypatch.setattr(script, "search_businesses", lambda *args, **kwargs: None)
+
+    job = service.submit({})
+    wait_for_jobs(service)
+
+    job = service.get(job["id"])
+    assert job["status"] == "failed"
+    assert job["error"] == "Failed to get coordinates"
+
+
+def test_submit_defaults_to_env_parameters(script, service, monkeypatch):
+    monkeypatch.setattr(script, "search_businesses", lambda *args, **kwargs: [])
+
+    job = service.submit({})
+
+    assert job["search_phrase"] == "restaurant"
+    assert job["GOOGLE_MAPS_LINK"] == "https://maps.app.goo.gl/abc"
+    assert job["RADIUS"] == 1000
+
+
+@pytest.mark.parametrize("request_body", [
+    ["restaurant"],
+    {"search_phrase": "../../x"},
+    {"search_phrase": "a/b"},
+    {"search_phrase": 5},
+    {"GOOGLE_MAPS_LINK": "http://169.254.169.254/latest"},
+    {"RADIUS": -5},
+    {"RADIUS": 5000000},
+    {"RADIUS": 1.5},
+    {"RADIUS": True},
+    {"RADIUS": float("inf")},
+])
+def test_submit_rejects_invalid_requests(service, request_body):
+    with pytest.raises(ValueError):
+        service.submit(request_body)
+    assert service.list() == []
+
+
+def test_jobs_get_separate_search_executors(script, env_params, monkeypatch):
+    service = script.SearchService(env_params, max_jobs=2, max_workers=4)
+    release = threading.Event()
+    executors = {}
+
+    def fake_search(env_params, country_codes_dict, search_phrase, maps_link, radius, executor=None):
+        executors[search_phrase] = executor
+        if search_phrase == "slow":
+            release.wait(5)
+        return []
+
+    monkeypatch.setattr(script, "search_businesses", fake_search)
+    slow = service.submit({"search_phrase": "slow"})
+    fast = service.submit({"search_phrase": "fast"})
+
+    # The second job finishes while the first still holds its executor
+    for _ in range(100):
+        if service.get(fast["id"])["status"] == "done":
+            break
+        time.sleep(0.05)
+    assert service.get(fast["id"])["status"] == "done"
+    assert service.get(slow["id"])["status"] == "running"
+
+    release.set()
+    service.shutdown()
+    assert executors["slow"] is not executors["fast"]
+    assert executors["slow"]._max_workers == 2
+
+
+def test_finished_jobs_are_pruned(script, service, monkeypatch):
+    monkeypatch.setattr(script, "search_businesses", lambda *args, **kwargs: [])
+    monkeypatch.setattr(script, "MAX_FINISHED_JOBS", 1)
+
+    first = service.submit({})
+    service.job_executor.submit(lambda: None).result()  # Wait for the first job
+    second = service.submit({})
+    service.job_executor.submit(lambda: None).result()
+    third = service.submit({})
+    wait_for_jobs(service)
+
+    job_ids = [job["id"] for job in service.list()]
+    assert first["id"] not in job_ids
+    assert second["id"] in job_ids and third["id"] in job_ids
+
+
+def test_expiring_cache_ttl_and_size(script, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(script.time, "monotonic", lambda: now[0])
+    cache = script.ExpiringCache(ttl_seconds=10, max_entries=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None  # Evicted as the oldest entry
+    assert cache.get("b") == 2
+
+    now[0] += 11
+    assert cache.get("c") is None
+    assert len(cache) == 1
+
+
+def test_place_details_only_caches_ok_responses(script, monkeypatch):
+    monkeypatch.setattr(script, "_place_details_cache", script.ExpiringCache())
+    responses = [FakeResponse(200, {"status": "OVER_QUERY_LIMIT"}),
+                 FakeResponse(200, {"status": "OK", "result": {"name": "A"}})]
+    monkeypatch.setattr(script.http_session, "get", lambda *args, **kwargs: responses.pop(0))
+
+    assert script.fetch_place_details("pid", "key") == {"status": "OVER_QUERY_LIMIT"}
+    assert script.fetch_place_details("pid", "key")["result"] == {"name": "A"}
+    assert script.fetch_place_details("pid", "key")["result"] == {"name": "A"}  # Served from cache
+    assert responses == []
+
+
+@pytest.fixture
+def server(script, service, monkeypatch):
+    monkeypatch.setattr(script, "search_businesses", lambda *args, **kwargs: [])
+    server = ThreadingHTTPServer(("127.0.0.1", 0), script.make_request_handler(service))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post_job(server, body, content_type="application/json"):
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.request("POST", "/jobs", body=body, headers={"Content-Type": content_type})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+
+def test_post_requires_json_content_type(server):
+    status, payload = post_job(server, json.dumps({}), content_type="text/plain")
+    assert status == 415
+
+
+def test_post_rejects_non_object_body(server):
+    status, payload = post_job(server, json.dumps(["restaurant"]))
+    assert status == 400
+
+
+def test_post_rejects_overflowing_radius(server):
+    status, payload = post_job(server, '{"RADIUS": 1e400}')
+    assert status == 400
+
+
+def test_post_and_get_job(server):
+    status, job = post_job(server, json.dumps({"search_phrase": "bakery"}))
+    assert status == 202
+
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.request("GET", f"/jobs/{job['id']}")
+    response = connection.getresponse()
+    assert response.status == 200
+    assert json.loads(response.read())["search_phrase"] == "bakery"
+    connection.close()